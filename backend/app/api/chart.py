@@ -0,0 +1,86 @@
+# app/api/chart.py
+from typing import Annotated, List, Optional, Dict, Any
+
+import numpy as np
+import pandas as pd
+from fastapi import APIRouter, Depends, Query, Request
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.api.types import Interval, Range
+from app.services import indicators as ind
+from app.services.corporate_actions import apply_adjustments, load_factors
+from app.services.prices import backfill, load_bars
+from app.services.yfinance_service import normalize_ticker
+from app.utils.http_cache import cached_response, store_response
+
+router = APIRouter(prefix="/api", tags=["chart"])
+
+def _col(s: pd.Series) -> list:
+    """Float column -> JSON list with None for warm-up / missing values."""
+    a = s.to_numpy(dtype="float64")
+    return np.where(np.isnan(a), None, a).tolist()
+
+@router.get("/chart")
+def get_chart(
+    request: Request,
+    ticker: Annotated[str, Query(min_length=1)],
+    range: Range = Query(Range.y1),                   # only used when backfilling
+    interval: Interval = Query(Interval.d1),
+    sma: Optional[List[int]] = Query(None, description="e.g. sma=20&sma=50"),
+    ema: Optional[List[int]] = Query(None, description="e.g. ema=12&ema=26"),
+    rsi_period: int = Query(14, ge=2, le=400),
+    bb_window: int = Query(20, ge=5, le=400),
+    bb_std: float = Query(2.0, ge=0.5, le=10.0),
+    adjusted: bool = Query(False, description="apply split/dividend factors on read"),
+    db: Session = Depends(get_db),
+):
+    """
+    Bars + indicators for one chart in a single payload: every column is a list aligned on `ts`
+    (indicator warm-up rows are null). One price query, one cache entry.
+    """
+    t = normalize_ticker(ticker)
+    sma = sorted(set(sma or [20, 50]))
+    ema = sorted(set(ema or [12, 26]))
+
+    key = (
+        f"chart:{t}:{range.value}:{interval.value}:"
+        f"sma={','.join(map(str, sma))}:ema={','.join(map(str, ema))}:"
+        f"rsi={rsi_period}:bb={bb_window}x{bb_std}"
+        + (":adj" if adjusted else "")
+    )
+    cached = cached_response(request, key)
+    if cached is not None:
+        return cached
+
+    df = load_bars(db, t, interval.value)
+    if df.empty:
+        backfill(db, t, range.value, interval.value)
+        df = load_bars(db, t, interval.value)
+    if adjusted:
+        df = apply_adjustments(df, load_factors(db, t))
+
+    close = df["close"].astype("float64")
+    indicators: Dict[str, list] = {}
+    for w in sma:
+        indicators[f"sma{w}"] = _col(ind.sma(close, w))
+    for w in ema:
+        indicators[f"ema{w}"] = _col(ind.ema(close, w))
+    indicators["rsi"] = _col(ind.rsi(close, rsi_period))
+    mid, up, lo = ind.bollinger(close, bb_window, bb_std)
+    indicators["bb_mid"], indicators["bb_upper"], indicators["bb_lower"] = _col(mid), _col(up), _col(lo)
+
+    vol = df["volume"].to_numpy(dtype="float64")
+    out: Dict[str, Any] = {
+        "ticker": t,
+        "interval": interval.value,
+        "adjusted": adjusted,
+        "ts": df["ts"].dt.strftime("%Y-%m-%dT%H:%M:%S+00:00").tolist(),
+        "open": _col(df["open"]),
+        "high": _col(df["high"]),
+        "low": _col(df["low"]),
+        "close": _col(close),
+        "volume": [None if np.isnan(v) else int(v) for v in vol],
+        "indicators": indicators,
+    }
+    return store_response(request, key, out)
@@ -0,0 +1,95 @@
+# app/api/corporate_actions.py
+from datetime import date
+from enum import Enum
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import BaseModel, Field
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.models.corporate_action import CorporateAction
+from app.services.corporate_actions import dividend_factor, split_factors
+from app.services.prices import invalidate_ticker
+from app.services.yfinance_service import normalize_ticker
+
+router = APIRouter(prefix="/api", tags=["corporate-actions"])
+
+class ActionKind(str, Enum):
+    split = "split"
+    dividend = "dividend"
+
+class ActionIn(BaseModel):
+    ticker: str
+    ex_date: date
+    kind: ActionKind
+    value: float = Field(gt=0, description="split ratio (4 for 4:1) or cash dividend per share")
+
+def serialize_action(a: CorporateAction) -> dict:
+    return {
+        "id": a.id,
+        "ticker": a.ticker,
+        "ex_date": a.ex_date.isoformat(),
+        "kind": a.kind,
+        "value": a.value,
+        "price_factor": a.price_factor,
+        "volume_factor": a.volume_factor,
+    }
+
+@router.get("/corporate-actions")
+def list_actions(ticker: Annotated[str, Query(min_length=1)], db: Session = Depends(get_db)):
+    t = normalize_ticker(ticker)
+    rows = db.execute(
+        select(CorporateAction)
+        .where(CorporateAction.ticker == t)
+        .order_by(CorporateAction.ex_date.asc())
+    ).scalars().all()
+    return {"ticker": t, "actions": [serialize_action(a) for a in rows]}
+
+@router.post("/corporate-actions")
+def add_action(body: ActionIn, db: Session = Depends(get_db)):
+    """
+    Record a split/dividend. Stored bars are left untouched; adjusted=true reads pick it up
+    once the ticker's cached payloads are dropped (done here). A split only touches bars ingested
+    before its ex_date; later fetches already arrive split-adjusted from Yahoo.
+    """
+    t = normalize_ticker(body.ticker)
+    if body.kind is ActionKind.split:
+        pf, vf = split_factors(body.value)
+    else:
+        pf = dividend_factor(db, t, body.ex_date, body.value)
+        if pf is None:
+            raise HTTPException(
+                status_code=422,
+                detail="need a stored 1d close before ex_date that exceeds the dividend; call /api/stock first",
+            )
+        vf = 1.0
+
+    a = CorporateAction(
+        ticker=t, ex_date=body.ex_date, kind=body.kind.value,
+        value=body.value, price_factor=pf, volume_factor=vf,
+    )
+    try:
+        db.add(a)
+        db.commit()
+        db.refresh(a)
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=409, detail="action already recorded for that date")
+
+    invalidate_ticker(t)
+    return serialize_action(a)
+
+@router.delete("/corporate-actions/{action_id}")
+def delete_action(action_id: int, db: Session = Depends(get_db)):
+    a = db.get(CorporateAction, action_id)
+    if not a:
+        # idempotent delete
+        return {"ok": True}
+    t = a.ticker
+    db.delete(a)
+    db.commit()
+    invalidate_ticker(t)
+    return {"ok": True}
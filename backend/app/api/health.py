@@ -2,6 +2,7 @@
 from fastapi import APIRouter
 from sqlalchemy import text
 from app.core.database import SessionLocal
+from app.services.yfinance_service import hedge_delay, latency
 import redis
 
 router = APIRouter()
@@ -23,3 +24,7 @@ def readyz():
     r = redis.Redis(host="redis", port=6379, decode_responses=True)
     r.ping()
     return {"ready": True}
+
+@router.get("/health/upstream")  # per-provider latency + current hedge budget
+def upstream():
+    return {"latency": latency.snapshot(), "hedge_delay": hedge_delay()}
@@ -3,14 +3,18 @@ from typing import Annotated, List, Optional, Dict, Any
 from datetime import timezone
 
 import pandas as pd
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
 from app.models.price import Price
-from app.utils.cache import cache_get, cache_set
-from app.api.types import Interval, Range  # enums you already have
+from app.utils.http_cache import cached_response, store_response
+from app.api.types import Interval, Range, StreamFormat  # enums you already have
+from app.services.corporate_actions import adjustment_multipliers, load_factors
+from app.services.prices import has_bars
+from app.services.streaming import NDJSON, stream_indicators
 
 router = APIRouter(prefix="/api", tags=["indicators"])
 
@@ -38,6 +42,7 @@ def bollinger(series: pd.Series, window: int = 20, stds: float = 2.0):
 # --- endpoint -----------------------------------------------------------------
 @router.get("/indicators")
 def get_indicators(
+    request: Request,
     ticker: Annotated[str, Query(min_length=1)],
     range: Range = Query(Range.y1),                   # kept for cache-key symmetry
     interval: Interval = Query(Interval.d1),
@@ -46,21 +51,36 @@ def get_indicators(
     rsi_period: int = Query(14, ge=2, le=400),
     bb_window: int = Query(20, ge=5, le=400),
     bb_std: float = Query(2.0, ge=0.5, le=10.0),
+    adjusted: bool = Query(False, description="compute on split/dividend-adjusted closes"),
+    stream: Optional[StreamFormat] = Query(None, description="one row per bar, all indicators, streamed"),
     db: Session = Depends(get_db),
 ):
     # defaults, if not provided
     sma = sma or [20, 50]
     ema = ema or [12, 26]
 
+    if stream is not None:
+        if not has_bars(db, ticker.upper(), interval.value):
+            raise HTTPException(
+                status_code=404,
+                detail="No price data available. Call /api/stock first to backfill.",
+            )
+        body = stream_indicators(
+            ticker.upper(), interval.value, stream,
+            sma=sma, ema=ema, rsi_period=rsi_period, bb_window=bb_window, bb_std=bb_std, adjusted=adjusted,
+        )
+        return StreamingResponse(body, media_type=NDJSON)
+
     # deterministic cache key (order of lists doesn’t matter)
     key = (
         f"ind:{ticker.upper()}:{range.value}:{interval.value}:"
         f"sma={','.join(map(str, sorted(sma)))}:"
         f"ema={','.join(map(str, sorted(ema)))}:"
         f"rsi={rsi_period}:bb={bb_window}x{bb_std}"
+        + (":adj" if adjusted else "")
     )
-    cached = cache_get(key)
-    if cached:
+    cached = cached_response(request, key)
+    if cached is not None:
         return cached
 
     # pull close prices from DB
@@ -86,9 +106,16 @@ def get_indicators(
             "ts": [r.ts if r.ts.tzinfo else r.ts.replace(tzinfo=timezone.utc) for r in rows],
             "close": [r.close for r in rows],
         }
-    ).set_index("ts")
+    )
+    if adjusted:
+        ingested = pd.Series([r.ingested_at for r in rows])
+        price_mult, _ = adjustment_multipliers(df["ts"], load_factors(db, ticker.upper()), ingested)
+        df["close"] = df["close"] * price_mult
+    df = df.set_index("ts")
 
-    out: Dict[str, Any] = {"ticker": ticker.upper(), "interval": interval.value, "indicators": {}}
+    out: Dict[str, Any] = {
+        "ticker": ticker.upper(), "interval": interval.value, "adjusted": adjusted, "indicators": {},
+    }
 
     # SMAs
     for w in sma:
@@ -113,5 +140,4 @@ def get_indicators(
         for ts, r in bb.iterrows()
     ]
 
-    cache_set(key, out)
-    return out
+    return store_response(request, key, out)
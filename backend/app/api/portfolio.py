@@ -1,14 +1,27 @@
 # backend/app/api/portfolio.py
-from fastapi import APIRouter, Depends, HTTPException
+import io
+import json
+from enum import Enum
+
+import numpy as np
+import pandas as pd
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
 from typing import Optional
-from sqlalchemy.orm import Session
-from sqlalchemy import select
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import select, delete, insert
 from sqlalchemy.exc import IntegrityError
 
 from app.core.database import get_db
 from app.models.portfolio import Portfolio, Holding
 from app.models.price import Price  # for summary latest price lookups
+from app.api.types import Interval, Range
+from app.services.prices import insert_bars
+from app.services.summary_cache import (
+    get_summary, holdings_changed, holdings_version, price_versions, prices_changed, put_summary,
+)
+from app.services.yfinance_service import fetch_ohlcv_many
 
 router = APIRouter(prefix="/api", tags=["portfolio"])
 
@@ -22,6 +35,10 @@ class HoldingPatch(BaseModel):
     qty: Optional[float] = None
     avg_price: Optional[float] = None
 
+class ImportMode(str, Enum):
+    upsert = "upsert"    # replace only the tickers present in the payload
+    replace = "replace"  # payload becomes the whole book
+
 class PortfolioOut(BaseModel):
     id: int
     name: str
@@ -46,6 +63,117 @@ def serialize_portfolio(p: Portfolio) -> dict:
         ],
     }
 
+def load_portfolio(db: Session, pf_id: int) -> Portfolio | None:
+    """Portfolio + holdings in one SELECT (LEFT OUTER JOIN), bypassing stale identity-map state."""
+    return db.execute(
+        select(Portfolio)
+        .where(Portfolio.id == pf_id)
+        .options(joinedload(Portfolio.holdings))
+        .execution_options(populate_existing=True)
+    ).unique().scalars().first()
+
+BULK_MAX_ROWS = 10_000
+
+def _parse_holdings(body: bytes, content_type: str) -> pd.DataFrame:
+    """CSV (header: ticker,qty,avg_price) or a JSON list of HoldingIn-shaped objects -> raw DataFrame."""
+    if "csv" in content_type:
+        try:
+            df = pd.read_csv(io.BytesIO(body), dtype=str, skipinitialspace=True)
+        except Exception as e:
+            raise HTTPException(status_code=422, detail=f"invalid CSV: {e}")
+        df.columns = [str(c).strip().lower() for c in df.columns]
+    else:
+        try:
+            rows = json.loads(body or b"null")
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=f"invalid JSON: {e}")
+        if isinstance(rows, dict):
+            rows = rows.get("holdings")
+        if not isinstance(rows, list) or not all(isinstance(r, dict) for r in rows):
+            raise HTTPException(status_code=422, detail="expected a list of {ticker, qty, avg_price}")
+        # [] behaves like a header-only CSV: a no-op upsert, or an empty book with mode=replace
+        df = pd.DataFrame(rows) if rows else pd.DataFrame(columns=["ticker", "qty", "avg_price"])
+
+    missing = {"ticker", "qty", "avg_price"} - set(df.columns)
+    if missing:
+        raise HTTPException(status_code=422, detail=f"missing columns: {sorted(missing)}")
+
+    if "csv" not in content_type:
+        # JSON keeps its types: qty/avg_price must be numbers (bool is an int subclass, so
+        # true would otherwise coerce to 1.0) and ticker a string
+        def _not_number(v) -> bool:
+            return isinstance(v, bool) or not isinstance(v, (int, float))
+
+        bad = (
+            df["qty"].map(_not_number)
+            | df["avg_price"].map(_not_number)
+            | ~df["ticker"].map(lambda v: isinstance(v, str))
+        )
+        if bad.any():
+            rows = [int(i) for i in df.index[bad][:20]]
+            raise HTTPException(
+                status_code=422,
+                detail={"error": "invalid types (ticker must be a string, qty/avg_price numbers)",
+                        "rows": rows, "count": int(bad.sum())},
+            )
+    if len(df) > BULK_MAX_ROWS:
+        raise HTTPException(status_code=413, detail=f"too many rows (max {BULK_MAX_ROWS})")
+    return df[["ticker", "qty", "avg_price"]]
+
+def _validate_holdings(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Column-wise validation of the whole payload at once.
+    Repeated tickers (multiple lots) are merged into one position at the qty-weighted average price.
+    """
+    out = pd.DataFrame({
+        "ticker": df["ticker"].astype("string").str.strip().str.upper(),
+        "qty": pd.to_numeric(df["qty"], errors="coerce").astype("float64"),
+        "avg_price": pd.to_numeric(df["avg_price"], errors="coerce").astype("float64"),
+    })
+
+    # isfinite also rejects NaN and the inf/Infinity that CSV and json.loads let through
+    bad = (
+        out["ticker"].isna() | (out["ticker"] == "")
+        | ~np.isfinite(out["qty"]) | (out["qty"] < 0)
+        | ~np.isfinite(out["avg_price"]) | (out["avg_price"] < 0)
+    )
+    if bad.any():
+        rows = [int(i) for i in out.index[bad][:20]]
+        raise HTTPException(
+            status_code=422,
+            detail={"error": "invalid rows (ticker required, qty/avg_price finite numbers >= 0)",
+                    "rows": rows, "count": int(bad.sum())},
+        )
+
+    out["cost"] = out["qty"] * out["avg_price"]
+    g = out.groupby("ticker", sort=True).agg(qty=("qty", "sum"), cost=("cost", "sum"), first_price=("avg_price", "first"))
+    # zero-qty lines keep their quoted price instead of dividing by zero
+    g["avg_price"] = (g["cost"] / g["qty"]).where(g["qty"] > 0, g["first_price"])
+    return g.reset_index()[["ticker", "qty", "avg_price"]]
+
+def _backfill_new_tickers(db: Session, tickers: list[str], period: str, interval: str) -> dict:
+    """Fetch history for tickers with no stored bars at `interval` using one upstream call."""
+    known = set(db.execute(
+        select(Price.ticker)
+        .where(Price.ticker.in_(tickers), Price.interval == interval)
+        .distinct()
+    ).scalars())
+    new = [t for t in tickers if t not in known]
+    if not new:
+        return {"backfilled": [], "missing": []}
+
+    try:
+        frames = fetch_ohlcv_many(new, period=period, interval=interval)
+    except HTTPException:
+        # the import itself already succeeded; don't fail it over upstream trouble
+        return {"backfilled": [], "missing": new}
+
+    for t, df in frames.items():
+        insert_bars(db, t, interval, df)
+    db.commit()
+    prices_changed(sorted(frames))
+    return {"backfilled": sorted(frames), "missing": [t for t in new if t not in frames]}
+
 # ---- Routes ----
 @router.post("/portfolio")
 def create_portfolio(payload: dict, db: Session = Depends(get_db)):
@@ -86,10 +214,62 @@ def add_holding(pf_id: int, body: HoldingIn, db: Session = Depends(get_db)):
     )
     db.add(h)
     db.commit()
+    holdings_changed(pf_id)
     db.refresh(p)
     _ = p.holdings
     return serialize_portfolio(p)
 
+@router.post("/portfolio/{pf_id}/holdings/bulk")
+async def bulk_import_holdings(
+    pf_id: int,
+    request: Request,
+    mode: ImportMode = Query(ImportMode.upsert),
+    backfill: bool = Query(False, description="fetch price history for tickers not stored yet"),
+    range: Range = Query(Range.y1),
+    interval: Interval = Query(Interval.d1),
+    db: Session = Depends(get_db),
+):
+    """
+    Import a broker export in one transaction.
+    Body is CSV (Content-Type: text/csv, header ticker,qty,avg_price) or a JSON list.
+    upsert: rows for tickers in the payload are deleted and re-inserted (so they get new ids);
+            holdings for other tickers are left alone and keep their ids.
+    replace: the payload becomes the entire book.
+    """
+    body = await request.body()
+    df = _validate_holdings(_parse_holdings(body, request.headers.get("content-type", "")))
+
+    def apply() -> dict:
+        if not db.get(Portfolio, pf_id):
+            raise HTTPException(status_code=404, detail="portfolio not found")
+
+        tickers = df["ticker"].tolist()
+        stmt = delete(Holding).where(Holding.portfolio_id == pf_id)
+        if mode is ImportMode.upsert:
+            stmt = stmt.where(Holding.ticker.in_(tickers))
+        try:
+            removed = db.execute(stmt).rowcount
+            if tickers:
+                db.execute(
+                    insert(Holding),
+                    [{"portfolio_id": pf_id, **r} for r in df.to_dict("records")],
+                )
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            raise HTTPException(status_code=409, detail="import conflicts with existing data")
+        holdings_changed(pf_id)
+
+        result = {"inserted": len(tickers), "removed": removed}
+        if backfill and tickers:
+            result.update(_backfill_new_tickers(db, tickers, range.value, interval.value))
+
+        out = serialize_portfolio(load_portfolio(db, pf_id))
+        out["import"] = result
+        return out
+
+    return await run_in_threadpool(apply)
+
 @router.patch("/portfolio/{pf_id}/holdings/{hid}")
 def update_holding(pf_id: int, hid: int, patch: HoldingPatch, db: Session = Depends(get_db)):
     p = db.get(Portfolio, pf_id)
@@ -105,6 +285,7 @@ def update_holding(pf_id: int, hid: int, patch: HoldingPatch, db: Session = Depe
         h.avg_price = patch.avg_price
 
     db.commit()
+    holdings_changed(pf_id)
     db.refresh(p)
     _ = p.holdings
     return serialize_portfolio(p)
@@ -120,6 +301,7 @@ def delete_holding(pf_id: int, hid: int, db: Session = Depends(get_db)):
 
     db.delete(h)
     db.commit()
+    holdings_changed(pf_id)
     db.refresh(p)
     _ = p.holdings
     return serialize_portfolio(p)
@@ -132,6 +314,7 @@ def delete_portfolio(pf_id: int, db: Session = Depends(get_db)):
         return {"ok": True}
     db.delete(p)
     db.commit()
+    holdings_changed(pf_id)
     return {"ok": True}
 
 # ---- Summary ----
@@ -140,11 +323,19 @@ def portfolio_summary(pf_id: int, db: Session = Depends(get_db)):
     """
     Returns per-position PnL plus totals.
     For 'last' price we take the most recent close in the prices table (any interval).
+    Cached until the holdings or any held ticker's prices change (see services/summary_cache.py).
     """
+    cached = get_summary(pf_id)
+    if cached is not None:
+        return cached
+
+    # versions are read before the data they describe: holdings version, holdings, price versions, closes
+    pf_ver = holdings_version(pf_id)
     p = db.get(Portfolio, pf_id)
     if not p:
         raise HTTPException(status_code=404, detail="portfolio not found")
     _ = p.holdings
+    versions = {"pf": pf_ver, "px": price_versions(sorted({h.ticker for h in p.holdings}))}
 
     positions = []
     total_cost = 0.0
@@ -187,9 +378,11 @@ def portfolio_summary(pf_id: int, db: Session = Depends(get_db)):
         "pnl": (total_value - total_cost) if positions else 0.0,
     }
 
-    return {
+    out = {
         "id": p.id,
         "name": p.name,
         "positions": positions,
         "totals": totals,
     }
+    put_summary(pf_id, out, versions)
+    return out
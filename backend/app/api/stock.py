@@ -1,29 +1,36 @@
 # app/api/stock.py
-from typing import Annotated
+from typing import Annotated, Optional
 from datetime import timezone
 
 import pandas as pd
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy import select
-from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
 from app.models.price import Price
-from app.services.yfinance_service import fetch_ohlcv, normalize_ticker
-from app.utils.cache import cache_get, cache_set
+from app.api.types import ROLLUP_INTERVALS, StreamFormat
+from app.services.prices import backfill, has_bars
+from app.services.streaming import NDJSON, stream_bars
+from app.services.corporate_actions import apply_adjustments, load_factors
+from app.services.yfinance_service import normalize_ticker
+from app.utils.http_cache import cached_response, store_response
 
 router = APIRouter(prefix="/api", tags=["stock"])
 
 # Input guards
-ALLOWED_INTERVALS = {"1d", "1m", "5m"}
+ALLOWED_INTERVALS = {"1d", "1m", "5m", *ROLLUP_INTERVALS}
 ALLOWED_RANGES = {"1y", "5y", "6mo", "3mo"}  # expand as your service supports more
 
 @router.get("/stock")
 def get_stock(
+    request: Request,
     ticker: Annotated[str, Query(min_length=1)],
     range: Annotated[str, Query()] = "1y",        # consider renaming to 'period' to avoid shadowing built-in
     interval: Annotated[str, Query()] = "1d",
+    adjusted: Annotated[bool, Query(description="apply split/dividend factors on read")] = False,
+    stream: Annotated[Optional[StreamFormat], Query(description="stream batches instead of one JSON body")] = None,
     db: Session = Depends(get_db),
 ):
     # Validate query params early
@@ -39,11 +46,18 @@ def get_stock(
         )
 
     t = normalize_ticker(ticker)
-    cache_key = f"stock:{t}:{range}:{interval}"
 
-    # 1) Try cache
-    cached = cache_get(cache_key)
-    if cached:
+    # Streaming: constant memory per request, so no whole-payload cache either
+    if stream is not None:
+        if not has_bars(db, t, interval):
+            backfill(db, t, range, interval)
+        return StreamingResponse(stream_bars(t, interval, stream, adjusted), media_type=NDJSON)
+
+    cache_key = f"stock:{t}:{range}:{interval}" + (":adj" if adjusted else "")
+
+    # 1) Try cache (ETag hit -> 304 without a DB query)
+    cached = cached_response(request, cache_key)
+    if cached is not None:
         return cached
 
     # 2) Try DB
@@ -53,29 +67,9 @@ def get_stock(
         .order_by(Price.ts.asc())
     ).scalars().all()
 
-    # 3) Backfill if DB empty
+    # 3) Backfill if DB empty (one INSERT; also bumps the price version for summaries)
     if not rows:
-        df = fetch_ohlcv(t, period=range, interval=interval)
-        if df.empty:
-            raise HTTPException(status_code=404, detail="No data for ticker/interval")
-
-        for _, r in df.iterrows():
-            rec = Price(
-                ticker=t,
-                interval=interval,
-                ts=pd.Timestamp(r["ts"]).to_pydatetime(),
-                open=float(r["open"]),
-                high=float(r["high"]),
-                low=float(r["low"]),
-                close=float(r["close"]),
-                volume=int(r["volume"]),
-            )
-            try:
-                db.add(rec)
-                db.commit()
-            except IntegrityError:
-                db.rollback()
-
+        backfill(db, t, range, interval)
         rows = db.execute(
             select(Price)
             .where(Price.ticker == t, Price.interval == interval)
@@ -97,8 +91,16 @@ def get_stock(
             "volume": r.volume,
         })
 
-    payload = {"ticker": t, "interval": interval, "data": data}
+    if adjusted and data:
+        factors = load_factors(db, t)
+        if not factors.empty:
+            frame = pd.DataFrame(data)
+            frame["ingested_at"] = [r.ingested_at for r in rows]
+            adj = apply_adjustments(frame, factors).drop(columns="ingested_at")
+            adj["volume"] = adj["volume"].map(lambda v: None if pd.isna(v) else int(v))
+            data = adj.astype(object).where(adj.notna(), None).to_dict("records")
+
+    payload = {"ticker": t, "interval": interval, "adjusted": adjusted, "data": data}
 
-    # 5) Cache it
-    cache_set(cache_key, payload)
-    return payload
+    # 5) Cache it (body, gzip copy and ETag stored together)
+    return store_response(request, cache_key, payload)
@@ -5,9 +5,18 @@ class Interval(str, Enum):
     d1 = "1d"
     m1 = "1m"
     m5 = "5m"
+    # written only by app.services.compaction; read-only, never backfilled from upstream
+    m5_rollup = "5m_rollup"   # 1m history past RETENTION_1M_DAYS
+    h1_rollup = "1h_rollup"   # 5m history past RETENTION_5M_DAYS
+
+ROLLUP_INTERVALS = {Interval.m5_rollup.value, Interval.h1_rollup.value}
 
 class Range(str, Enum):
     y1 = "1y"
     y5 = "5y"
     m6 = "6mo"
     m3 = "3mo"
+
+class StreamFormat(str, Enum):
+    ndjson = "ndjson"       # one JSON object per bar per line
+    columnar = "columnar"   # one {column: [values]} object per batch per line
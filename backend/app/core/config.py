@@ -17,6 +17,20 @@ class Settings(BaseSettings):
 
     ALLOWED_ORIGINS: str = "*"
 
+    # Hedged upstream fetches (1d/1wk/1mo): start Stooq if Yahoo is slower than this.
+    # 0 -> use Yahoo's rolling p95 (HEDGE_DEFAULT_DELAY_SECONDS until there are enough samples)
+    HEDGE_ENABLED: bool = True
+    HEDGE_DELAY_SECONDS: float = 0.0
+    HEDGE_DEFAULT_DELAY_SECONDS: float = 2.0
+    HEDGE_MIN_DELAY_SECONDS: float = 0.25
+    HEDGE_DEADLINE_SECONDS: float = 15.0   # overall cap on a hedged fetch (both providers)
+    UPSTREAM_POOL_SIZE: int = 40           # per provider; matches the default request threadpool
+
+    # Intraday retention (app.services.compaction): older bars are rolled up 1m -> 5m -> 1h
+    # into separate 5m_rollup / 1h_rollup series
+    RETENTION_1M_DAYS: int = 30
+    RETENTION_5M_DAYS: int = 180
+
     @property
     def database_url(self) -> str:
         return (
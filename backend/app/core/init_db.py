@@ -1,6 +1,16 @@
+from sqlalchemy import text
+
 from app.core.database import Base, engine
 from app.models.price import Price  
 from app.models import portfolio
+from app.models import corporate_action
 
 def init_db():
     Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        # prices predating ingested_at get the epoch, i.e. "fetched before every split"
+        # (the old behaviour); new rows default to now()
+        conn.execute(text(
+            "ALTER TABLE prices ADD COLUMN IF NOT EXISTS ingested_at TIMESTAMPTZ NOT NULL DEFAULT 'epoch'"
+        ))
+        conn.execute(text("ALTER TABLE prices ALTER COLUMN ingested_at SET DEFAULT now()"))
@@ -1,7 +1,7 @@
 # app/main.py
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.api import health, stock, indicators, portfolio
+from app.api import health, stock, indicators, chart, portfolio, corporate_actions
 
 app = FastAPI()
 
@@ -12,8 +12,9 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
 # include routers
-for r in (health.router, stock.router, indicators.router, portfolio.router):
+for r in (health.router, stock.router, indicators.router, chart.router, portfolio.router, corporate_actions.router):
     app.include_router(r, prefix="/api")
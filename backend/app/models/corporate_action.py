@@ -0,0 +1,26 @@
+from datetime import date
+
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import String, BigInteger, Float, Date, UniqueConstraint, CheckConstraint
+from app.core.database import Base
+
+class CorporateAction(Base):
+    """
+    Splits/dividends, kept apart from the raw bars in `prices`.
+    price_factor / volume_factor are what every bar *before* ex_date gets multiplied by.
+    """
+    __tablename__ = "corporate_actions"
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    ticker: Mapped[str] = mapped_column(String, nullable=False, index=True)
+    ex_date: Mapped[date] = mapped_column(Date, nullable=False)
+    kind: Mapped[str] = mapped_column(String, nullable=False)          # "split" | "dividend"
+    value: Mapped[float] = mapped_column(Float(asdecimal=False), nullable=False)  # split ratio or cash amount
+    price_factor: Mapped[float] = mapped_column(Float(asdecimal=False), nullable=False)
+    volume_factor: Mapped[float] = mapped_column(Float(asdecimal=False), nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("ticker", "ex_date", "kind", name="uq_action_ticker_date_kind"),
+        CheckConstraint("kind IN ('split', 'dividend')", name="chk_action_kind"),
+        CheckConstraint("price_factor > 0 AND volume_factor > 0", name="chk_action_factors_pos"),
+    )
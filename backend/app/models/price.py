@@ -1,5 +1,7 @@
+from datetime import datetime
+
 from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy import String, BigInteger, Float, TIMESTAMP, UniqueConstraint
+from sqlalchemy import String, BigInteger, Float, TIMESTAMP, UniqueConstraint, func
 from app.core.database import Base
 
 class Price(Base):
@@ -14,5 +16,7 @@ class Price(Base):
     low: Mapped[float | None] = mapped_column(Float(asdecimal=False))
     close: Mapped[float | None] = mapped_column(Float(asdecimal=False))
     volume: Mapped[int | None] = mapped_column(BigInteger)
+    # when the bar was fetched: Yahoo's Close is already split-adjusted as of that moment
+    ingested_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), nullable=False, server_default=func.now())
 
     __table_args__ = (UniqueConstraint("ticker", "ts", "interval", name="uq_ticker_ts_interval"),)
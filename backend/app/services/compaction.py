@@ -0,0 +1,145 @@
+# backend/app/services/compaction.py
+"""
+Retention + rollup for intraday bars.
+
+    python -m app.services.compaction --dry-run     # report what would go
+    python -m app.services.compaction [--vacuum]    # roll up, delete, optionally VACUUM
+
+Bars older than the interval's retention are aggregated into the next coarser bucket
+(1m -> 5m -> 1h), written with one INSERT per ticker, then removed with one DELETE per ticker.
+
+Rollups get their own interval labels (5m_rollup, 1h_rollup) instead of joining the 5m/1h
+series that /api/stock backfills from Yahoo: Yahoo's hourly bars start at :30, and a series
+holding only old rollups would also look "already backfilled" and stop new fetches.
+Read them back with interval=5m_rollup / 1h_rollup on /api/stock, /api/chart or /api/indicators.
+"""
+import argparse
+import json
+
+import pandas as pd
+from sqlalchemy import delete, func, select, text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal, engine
+from app.api.types import Interval
+from app.models.price import Price
+from app.services.prices import insert_bars, invalidate_ticker, load_bars
+
+# source interval -> (rollup interval, pandas freq, bucket seconds); processed in this order
+ROLLUPS = {
+    "1m": (Interval.m5_rollup.value, "5min", 300),
+    "5m": (Interval.h1_rollup.value, "1h", 3600),
+    Interval.m5_rollup.value: (Interval.h1_rollup.value, "1h", 3600),
+}
+
+def retention_days() -> dict[str, int]:
+    return {
+        "1m": settings.RETENTION_1M_DAYS,
+        "5m": settings.RETENTION_5M_DAYS,
+        Interval.m5_rollup.value: settings.RETENTION_5M_DAYS,
+    }
+
+def cutoff_for(interval: str, now: pd.Timestamp) -> pd.Timestamp:
+    """Retention boundary floored to the rollup bucket, so only complete buckets are compacted."""
+    _, freq, _ = ROLLUPS[interval]
+    return (now - pd.Timedelta(days=retention_days()[interval])).floor(freq)
+
+def rollup(df: pd.DataFrame, freq: str) -> pd.DataFrame:
+    """
+    OHLCV resample: first/max/min/last/sum per bucket; empty buckets (gaps, closed market) dropped.
+    ingested_at (when present) keeps the latest fetch in the bucket, so split adjustment still applies.
+    """
+    how = {"open": "first", "high": "max", "low": "min", "close": "last", "volume": "sum"}
+    if "ingested_at" in df:
+        how["ingested_at"] = "max"
+    out = (
+        df.set_index("ts")
+        .resample(freq, label="left", closed="left")
+        .agg(how)
+        .dropna(subset=["open", "high", "low", "close"])
+    )
+    return out.reset_index()
+
+def _avg_row_bytes(db: Session) -> float:
+    """Heap + index bytes per row from catalog stats (no table scan)."""
+    size, rows = db.execute(text(
+        "SELECT pg_total_relation_size('prices')::float8, GREATEST(reltuples, 1)::float8 "
+        "FROM pg_class WHERE oid = 'prices'::regclass"
+    )).one()
+    return size / rows
+
+def _plan(db: Session, interval: str, cutoff: pd.Timestamp) -> list[dict]:
+    """Per ticker: rows past retention and how many rollup buckets they'd collapse into."""
+    _, _, secs = ROLLUPS[interval]
+    bucket = func.floor(func.date_part("epoch", Price.ts) / secs)
+    rows = db.execute(
+        select(Price.ticker, func.count(), func.count(func.distinct(bucket)))
+        .where(Price.interval == interval, Price.ts < cutoff.to_pydatetime())
+        .group_by(Price.ticker)
+        .order_by(Price.ticker)
+    ).all()
+    return [{"ticker": t, "rows": n, "rollup_rows": b} for t, n, b in rows]
+
+def compact(db: Session, dry_run: bool = True, now: pd.Timestamp | None = None) -> dict:
+    now = now or pd.Timestamp.now(tz="UTC")
+    row_bytes = _avg_row_bytes(db)
+    report: dict = {"dry_run": dry_run, "intervals": {}}
+    total_deleted = total_written = 0
+
+    # 1m first: its rollups land in 5m_rollup, which then ages out like raw 5m bars.
+    # Raw 5m goes before 5m_rollup so, where both cover an hour, the 1h rollup is built from raw bars.
+    for interval, (target, freq, _) in ROLLUPS.items():
+        cutoff = cutoff_for(interval, now)
+        plan = _plan(db, interval, cutoff)
+        deleted = sum(p["rows"] for p in plan)
+        written = sum(p["rollup_rows"] for p in plan)
+
+        if not dry_run:
+            for p in plan:
+                t = p["ticker"]
+                bars = load_bars(db, t, interval, before=cutoff.to_pydatetime())
+                insert_bars(db, t, target, rollup(bars, freq))
+                db.execute(
+                    delete(Price)
+                    .where(Price.ticker == t, Price.interval == interval, Price.ts < cutoff.to_pydatetime())
+                    .execution_options(synchronize_session=False)
+                )
+                db.commit()  # one ticker per transaction keeps locks and WAL bursts small
+                invalidate_ticker(t)
+
+        report["intervals"][interval] = {
+            "cutoff": cutoff.isoformat(),
+            "rollup_to": target,
+            "tickers": len(plan),
+            "rows_deleted": deleted,
+            "rollup_rows": written,
+            "bytes_reclaimed_est": int((deleted - written) * row_bytes),
+        }
+        total_deleted += deleted
+        total_written += written
+
+    report["rows_deleted"] = total_deleted
+    report["rollup_rows"] = total_written
+    report["bytes_reclaimed_est"] = int((total_deleted - total_written) * row_bytes)
+    return report
+
+def vacuum() -> None:
+    """DELETE only marks tuples dead; VACUUM makes the space reusable (needs autocommit)."""
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("VACUUM (ANALYZE) prices"))
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Roll up and prune intraday bars past retention.")
+    ap.add_argument("--dry-run", action="store_true", help="report rows/bytes only, change nothing")
+    ap.add_argument("--vacuum", action="store_true", help="VACUUM (ANALYZE) prices afterwards")
+    args = ap.parse_args()
+
+    with SessionLocal() as db:
+        report = compact(db, dry_run=args.dry_run)
+    if args.vacuum and not args.dry_run:
+        vacuum()
+    print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# backend/app/services/corporate_actions.py
+from datetime import date
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.corporate_action import CorporateAction
+from app.models.price import Price
+
+def split_factors(ratio: float) -> tuple[float, float]:
+    """4:1 split -> ratio 4: earlier prices / 4, earlier volumes * 4."""
+    return 1.0 / ratio, ratio
+
+def dividend_factor(db: Session, ticker: str, ex_date: date, amount: float) -> float | None:
+    """Yahoo-style multiplier 1 - div / prev_close, using the last stored daily close before ex_date."""
+    prev_close = db.execute(
+        select(Price.close)
+        .where(Price.ticker == ticker, Price.interval == "1d", Price.ts < pd.Timestamp(ex_date, tz="UTC"))
+        .order_by(Price.ts.desc())
+        .limit(1)
+    ).scalar_one_or_none()
+    if not prev_close or amount >= prev_close:
+        return None
+    return 1.0 - amount / float(prev_close)
+
+def load_factors(db: Session, ticker: str) -> pd.DataFrame:
+    """All actions for a ticker as ex_ts (UTC midnight), kind, price_factor, volume_factor, oldest first."""
+    rows = db.execute(
+        select(CorporateAction.ex_date, CorporateAction.kind, CorporateAction.price_factor, CorporateAction.volume_factor)
+        .where(CorporateAction.ticker == ticker)
+        .order_by(CorporateAction.ex_date.asc())
+    ).all()
+    df = pd.DataFrame(rows, columns=["ex_date", "kind", "price_factor", "volume_factor"])
+    df["ex_ts"] = pd.to_datetime(df["ex_date"]).dt.tz_localize("UTC")
+    return df[["ex_ts", "kind", "price_factor", "volume_factor"]]
+
+def _to_ns(ts: pd.Series) -> np.ndarray:
+    return pd.to_datetime(pd.Series(ts), utc=True).dt.tz_convert(None).to_numpy(dtype="datetime64[ns]")
+
+def _cumulative(keys: np.ndarray, actions: pd.DataFrame, col: str) -> np.ndarray:
+    """Product of actions[col] over every action whose ex_ts is after each key (reverse cumprod + searchsorted)."""
+    if actions.empty:
+        return np.ones(len(keys))
+    ex = _to_ns(actions["ex_ts"])
+    # cum[i] = prod(factors[i:]); trailing 1.0 covers keys on/after the last ex_date
+    cum = np.append(np.cumprod(actions[col].to_numpy(dtype="float64")[::-1])[::-1], 1.0)
+    return cum[np.searchsorted(ex, keys, side="right")]
+
+def adjustment_multipliers(
+    ts: pd.Series, factors: pd.DataFrame, ingested_at: pd.Series | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Per-bar cumulative (price, volume) multipliers.
+
+    Dividends apply to every bar before their ex_date (yfinance's Close isn't dividend-adjusted).
+    Splits apply only to bars that are before the ex_date *and* were ingested before it: anything
+    fetched later already came back split-adjusted. "ts < ex and ingested < ex" is
+    "max(ts, ingested) < ex", so both cases stay one searchsorted each.
+    """
+    n = len(ts)
+    if factors.empty or n == 0:
+        return np.ones(n), np.ones(n)
+
+    bars = _to_ns(ts)
+    split_keys = bars if ingested_at is None else np.maximum(bars, _to_ns(ingested_at))
+
+    splits = factors[factors["kind"] == "split"]
+    divs = factors[factors["kind"] != "split"]
+    pm = _cumulative(split_keys, splits, "price_factor") * _cumulative(bars, divs, "price_factor")
+    vm = _cumulative(split_keys, splits, "volume_factor") * _cumulative(bars, divs, "volume_factor")
+    return pm, vm
+
+def apply_adjustments(df: pd.DataFrame, factors: pd.DataFrame) -> pd.DataFrame:
+    """
+    Adjusted copy of a bar frame with a `ts` (and ideally `ingested_at`) column;
+    only the OHLC/volume columns present are touched.
+    """
+    if factors.empty or df.empty:
+        return df
+    pm, vm = adjustment_multipliers(df["ts"], factors, df.get("ingested_at"))
+    out = df.copy()
+    for c in ("open", "high", "low", "close"):
+        if c in out:
+            out[c] = out[c] * pm
+    if "volume" in out:
+        out["volume"] = (out["volume"] * vm).round()
+    return out
@@ -13,7 +13,7 @@ def rsi(series: pd.Series, period: int = 14):
     rs = gain / loss
     return 100 - (100 / (1 + rs))
 
-def bollinger(series: pd.Series, window: int = 20, num_std: int = 2):
+def bollinger(series: pd.Series, window: int = 20, num_std: float = 2):
     mid = sma(series, window)
     std = series.rolling(window).std()
     upper = mid + num_std * std
@@ -0,0 +1,81 @@
+# backend/app/services/prices.py
+from datetime import datetime
+
+import pandas as pd
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.api.types import ROLLUP_INTERVALS
+from app.models.price import Price
+from app.services.summary_cache import prices_changed
+from app.services.yfinance_service import fetch_ohlcv
+from app.utils.cache import cache_delete_prefix
+from app.utils.http_cache import PREFIX as HTTP_PREFIX
+
+BAR_COLUMNS = ["ts", "open", "high", "low", "close", "volume"]
+
+def load_bars(db: Session, ticker: str, interval: str, before: datetime | None = None) -> pd.DataFrame:
+    """
+    One column-only SELECT straight into a frame (no Price objects), ts as UTC, oldest first.
+    Carries ingested_at alongside BAR_COLUMNS so split adjustment can tell pre-/post-split fetches apart.
+    """
+    stmt = (
+        select(Price.ts, Price.open, Price.high, Price.low, Price.close, Price.volume, Price.ingested_at)
+        .where(Price.ticker == ticker, Price.interval == interval)
+        .order_by(Price.ts.asc())
+    )
+    if before is not None:
+        stmt = stmt.where(Price.ts < before)
+    df = pd.DataFrame(db.execute(stmt).all(), columns=[*BAR_COLUMNS, "ingested_at"])
+    df["ts"] = pd.to_datetime(df["ts"], utc=True)
+    df["ingested_at"] = pd.to_datetime(df["ingested_at"], utc=True)
+    return df
+
+def has_bars(db: Session, ticker: str, interval: str) -> bool:
+    return db.execute(
+        select(Price.id).where(Price.ticker == ticker, Price.interval == interval).limit(1)
+    ).first() is not None
+
+def backfill(db: Session, ticker: str, period: str, interval: str) -> int:
+    """Fetch upstream history and store it in one INSERT (404 if the provider has nothing)."""
+    if interval in ROLLUP_INTERVALS:
+        # compaction output; Yahoo has no such series to fetch
+        raise HTTPException(status_code=404, detail=f"No compacted {interval} bars for {ticker} yet")
+    n = insert_bars(db, ticker, interval, fetch_ohlcv(ticker, period=period, interval=interval))
+    db.commit()
+    prices_changed([ticker])
+    return n
+
+def insert_bars(db: Session, ticker: str, interval: str, df: pd.DataFrame) -> int:
+    """
+    Write a fetch_ohlcv-shaped frame in one multi-row INSERT.
+    Bars that already exist (uq_ticker_ts_interval) are skipped, not overwritten.
+    An ingested_at column is kept (rollups inherit it); otherwise the DB stamps now().
+    Does not commit: the caller owns the transaction.
+    """
+    if df is None or df.empty:
+        return 0
+
+    frame = pd.DataFrame({
+        "ticker": ticker,
+        "interval": interval,
+        "ts": pd.to_datetime(df["ts"], utc=True),
+        "open": df["open"].astype(float),
+        "high": df["high"].astype(float),
+        "low": df["low"].astype(float),
+        "close": df["close"].astype(float),
+        "volume": df["volume"].astype("int64"),
+    })
+    if "ingested_at" in df:
+        frame["ingested_at"] = pd.to_datetime(df["ingested_at"], utc=True)
+    records = frame.to_dict("records")
+
+    stmt = pg_insert(Price).on_conflict_do_nothing(constraint="uq_ticker_ts_interval")
+    db.execute(stmt, records)
+    return len(records)
+
+def invalidate_ticker(ticker: str) -> int:
+    """Drop every cached stock/indicator/chart payload for a ticker (all ranges, intervals, params)."""
+    return sum(cache_delete_prefix(f"{HTTP_PREFIX}{p}") for p in (f"stock:{ticker}:", f"ind:{ticker}:", f"chart:{ticker}:"))
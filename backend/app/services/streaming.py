@@ -0,0 +1,108 @@
+# backend/app/services/streaming.py
+"""
+Constant-memory readers for large histories: a server-side cursor hands rows over in
+fixed-size batches, each batch is encoded and sent, then dropped.
+"""
+import json
+from typing import Iterable, Iterator
+
+import pandas as pd
+from sqlalchemy import select
+
+from app.api.types import StreamFormat
+from app.core.database import SessionLocal
+from app.models.price import Price
+from app.services import indicators as ind
+from app.services.corporate_actions import apply_adjustments, load_factors
+from app.services.prices import BAR_COLUMNS
+
+STREAM_BATCH_ROWS = 5000
+NDJSON = "application/x-ndjson"
+
+def iter_bar_batches(
+    ticker: str, interval: str, adjusted: bool = False, batch_size: int = STREAM_BATCH_ROWS,
+) -> Iterator[pd.DataFrame]:
+    """
+    Bars oldest first, `batch_size` rows at a time.
+    Opens its own session: the request's get_db session is closed before a StreamingResponse body runs.
+    """
+    with SessionLocal() as db:
+        factors = load_factors(db, ticker) if adjusted else None
+        result = db.execute(
+            select(Price.ts, Price.open, Price.high, Price.low, Price.close, Price.volume, Price.ingested_at)
+            .where(Price.ticker == ticker, Price.interval == interval)
+            .order_by(Price.ts.asc())
+            .execution_options(yield_per=batch_size)  # psycopg2 named cursor, not a full fetch
+        )
+        for part in result.partitions():
+            df = pd.DataFrame(part, columns=[*BAR_COLUMNS, "ingested_at"])
+            df["ts"] = pd.to_datetime(df["ts"], utc=True)
+            if factors is not None:
+                df = apply_adjustments(df, factors)
+            yield df[BAR_COLUMNS]
+
+def _encode(df: pd.DataFrame, fmt: StreamFormat) -> bytes:
+    df = df.copy()
+    df["ts"] = df["ts"].dt.strftime("%Y-%m-%dT%H:%M:%S+00:00")
+    if "volume" in df:
+        df["volume"] = df["volume"].round().astype("Int64")
+    if fmt is StreamFormat.columnar:
+        cols = df.astype(object).where(df.notna(), None).to_dict("list")
+        return (json.dumps(cols, separators=(",", ":")) + "\n").encode()
+    out = df.to_json(orient="records", lines=True)
+    # pandas >= 2.2 already terminates the last line; a second \n would be an empty NDJSON record
+    return (out if out.endswith("\n") else out + "\n").encode()
+
+def stream_bars(ticker: str, interval: str, fmt: StreamFormat, adjusted: bool = False) -> Iterator[bytes]:
+    for df in iter_bar_batches(ticker, interval, adjusted):
+        yield _encode(df, fmt)
+
+def indicator_batches(
+    batches: Iterable[pd.DataFrame], *,
+    sma: list[int], ema: list[int], rsi_period: int, bb_window: int, bb_std: float,
+) -> Iterator[pd.DataFrame]:
+    """
+    Bar batches (ts, close, ...) -> indicator batches (ts, sma*, ema*, rsi, bb_*), one row per bar.
+    Same numbers as computing over the whole series at once: rolling indicators see the previous
+    batch's last `lookback` closes, and EMAs are seeded with their last value, which is exact
+    for adjust=False.
+    """
+    lookback = max([*sma, rsi_period + 1, bb_window])
+    tail = pd.Series(dtype="float64")
+    ema_last: dict[int, float | None] = {w: None for w in ema}
+
+    for df in batches:
+        close = df["close"].astype("float64").reset_index(drop=True)
+        ext = pd.concat([tail, close], ignore_index=True)
+        k = len(tail)
+
+        out = pd.DataFrame({"ts": df["ts"].reset_index(drop=True)})
+        for w in sma:
+            out[f"sma{w}"] = ind.sma(ext, w).iloc[k:].to_numpy()
+        for w in ema:
+            prev = ema_last[w]
+            seeded = close if prev is None else pd.concat([pd.Series([prev]), close], ignore_index=True)
+            e = ind.ema(seeded, w)
+            if prev is not None:
+                e = e.iloc[1:]
+            out[f"ema{w}"] = e.to_numpy()
+            ema_last[w] = float(e.iloc[-1])
+        out["rsi"] = ind.rsi(ext, rsi_period).iloc[k:].to_numpy()
+        mid, up, lo = ind.bollinger(ext, bb_window, bb_std)
+        out["bb_mid"] = mid.iloc[k:].to_numpy()
+        out["bb_upper"] = up.iloc[k:].to_numpy()
+        out["bb_lower"] = lo.iloc[k:].to_numpy()
+
+        tail = ext.iloc[-lookback:]
+        yield out
+
+def stream_indicators(
+    ticker: str, interval: str, fmt: StreamFormat, *,
+    sma: list[int], ema: list[int], rsi_period: int, bb_window: int, bb_std: float, adjusted: bool = False,
+) -> Iterator[bytes]:
+    batches = indicator_batches(
+        iter_bar_batches(ticker, interval, adjusted),
+        sma=sma, ema=ema, rsi_period=rsi_period, bb_window=bb_window, bb_std=bb_std,
+    )
+    for out in batches:
+        yield _encode(out, fmt)
@@ -0,0 +1,59 @@
+# backend/app/services/summary_cache.py
+"""
+Portfolio summary cache.
+
+An entry is valid while the portfolio's holdings version and the price version of every
+ticker it holds are unchanged. Holdings routes bump pf:ver:<id>; price ingests bump
+px:ver:<ticker> and evict the summaries listed in the px:holders:<ticker> reverse index.
+"""
+from app.utils.cache import cache_delete, cache_get, cache_incr, cache_mget, cache_sadd, cache_set, cache_sunion
+
+def _pf_ver(pf_id: int) -> str:
+    return f"pf:ver:{pf_id}"
+
+def _px_ver(ticker: str) -> str:
+    return f"px:ver:{ticker}"
+
+def _holders(ticker: str) -> str:
+    return f"px:holders:{ticker}"
+
+def _summary(pf_id: int) -> str:
+    return f"pf:summary:{pf_id}"
+
+def holdings_version(pf_id: int) -> str | None:
+    """Read *before* loading holdings, so a concurrent edit makes the stored entry stale, not wrong."""
+    return cache_mget([_pf_ver(pf_id)])[0]
+
+def price_versions(tickers: list[str]) -> dict[str, str | None]:
+    """Read *before* looking up closes, for the same reason."""
+    return dict(zip(tickers, cache_mget([_px_ver(t) for t in tickers])))
+
+def current_versions(pf_id: int, tickers: list[str]) -> dict:
+    vals = cache_mget([_pf_ver(pf_id)] + [_px_ver(t) for t in tickers])
+    return {"pf": vals[0], "px": dict(zip(tickers, vals[1:]))}
+
+def get_summary(pf_id: int) -> dict | None:
+    entry = cache_get(_summary(pf_id))
+    if not entry:
+        return None
+    stored = entry["versions"]
+    if current_versions(pf_id, sorted(stored["px"])) != stored:
+        return None
+    return entry["summary"]
+
+def put_summary(pf_id: int, summary: dict, versions: dict) -> None:
+    cache_set(_summary(pf_id), {"versions": versions, "summary": summary})
+    # holders sets only grow; a stale member just costs one no-op delete on ingest
+    cache_sadd({_holders(t): [pf_id] for t in versions["px"]})
+
+def holdings_changed(pf_id: int) -> None:
+    cache_incr(_pf_ver(pf_id))
+    cache_delete(_summary(pf_id))
+
+def prices_changed(tickers: list[str]) -> None:
+    """Call after the ingest has committed."""
+    if not tickers:
+        return
+    cache_incr(*(_px_ver(t) for t in tickers))
+    pf_ids = cache_sunion([_holders(t) for t in tickers])
+    cache_delete(*(_summary(int(i)) for i in pf_ids))
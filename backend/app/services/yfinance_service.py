@@ -1,15 +1,27 @@
 # app/services/yfinance_service.py
+import logging
+import threading
 import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import timezone
 from typing import Literal, Optional
 
+import numpy as np
 import pandas as pd
 import requests
 import yfinance as yf
 from fastapi import HTTPException  # map upstream problems to clean HTTP codes
 
+from app.core.config import settings
+
 Period = Literal["5d","1mo","3mo","6mo","1y","2y","5y","10y","ytd","max"]
 
+log = logging.getLogger(__name__)
+
+# intervals Stooq can serve, i.e. the ones worth hedging
+STOOQ_FREQ = {"1d": "d", "1wk": "w", "1mo": "m"}
+
 _UA = (
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
     "(KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"
@@ -26,25 +38,98 @@ def _session() -> requests.Session:
 def normalize_ticker(t: str) -> str:
     return t.strip().upper()
 
-def _download_yf(ticker: str, period: Period, interval: str) -> pd.DataFrame:
-    """Try Yahoo via yfinance with polite retries/backoff."""
+# --- per-provider latency ------------------------------------------------------
+class _LatencyTracker:
+    """Rolling window of call durations per provider (thread-safe; requests run in a threadpool)."""
+
+    def __init__(self, size: int = 200):
+        self._size = size
+        self._samples: dict[str, deque] = {}
+        self._lock = threading.Lock()
+
+    def record(self, provider: str, seconds: float) -> None:
+        with self._lock:
+            self._samples.setdefault(provider, deque(maxlen=self._size)).append(seconds)
+
+    def quantile(self, provider: str, q: float, min_samples: int = 20) -> float | None:
+        with self._lock:
+            xs = list(self._samples.get(provider, ()))
+        if len(xs) < min_samples:
+            return None
+        return float(np.quantile(xs, q))
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            data = {k: list(v) for k, v in self._samples.items()}
+        return {
+            k: {"n": len(xs), "p50": float(np.quantile(xs, 0.5)), "p95": float(np.quantile(xs, 0.95))}
+            for k, xs in data.items() if xs
+        }
+
+latency = _LatencyTracker()
+
+# Hedged calls need their own workers; the request thread just waits on them. One pool per
+# provider, each as large as the request threadpool (UPSTREAM_POOL_SIZE), so a request's Stooq
+# hedge never queues behind other requests' slow Yahoo calls and vice versa.
+_YAHOO_POOL = ThreadPoolExecutor(max_workers=settings.UPSTREAM_POOL_SIZE, thread_name_prefix="yahoo")
+_STOOQ_POOL = ThreadPoolExecutor(max_workers=settings.UPSTREAM_POOL_SIZE, thread_name_prefix="stooq")
+
+def _timed(provider: str, fn, *args, cancel: threading.Event | None = None):
+    """Whole-call latency sample (Stooq makes a single request; Yahoo records per attempt itself)."""
+    if cancel is not None and cancel.is_set():
+        # the race was decided before this call even started: nothing to measure
+        return pd.DataFrame()
+    start = time.perf_counter()
+    try:
+        return fn(*args)
+    finally:
+        # A loser stopped mid-flight still counts: its elapsed time is a lower bound on the
+        # provider's latency. Dropping it would leave only the calls that beat the hedge and
+        # drag the p95 budget down until Stooq fires on every request.
+        latency.record(provider, time.perf_counter() - start)
+
+def hedge_delay() -> float:
+    """
+    How long Yahoo gets before Stooq is started alongside it.
+    Samples are single yf.download attempts (see _download_yf), so retry backoff never inflates the p95.
+    """
+    if settings.HEDGE_DELAY_SECONDS > 0:
+        return settings.HEDGE_DELAY_SECONDS
+    p95 = latency.quantile("yahoo", 0.95)
+    if p95 is None:
+        return settings.HEDGE_DEFAULT_DELAY_SECONDS
+    return max(settings.HEDGE_MIN_DELAY_SECONDS, p95)
+
+def _download_yf(
+    ticker: str, period: Period, interval: str, cancel: threading.Event | None = None,
+) -> pd.DataFrame:
+    """Try Yahoo via yfinance with polite retries/backoff. Setting `cancel` stops further retries."""
     backoffs = [0.0, 1.0, 2.0, 4.0]
     last_err: Optional[str] = None
 
     for delay in backoffs:
-        if delay:
+        if cancel is not None:
+            # wait() returns early (True) once the other provider has won
+            if (delay and cancel.wait(delay)) or cancel.is_set():
+                return pd.DataFrame()
+        elif delay:
             time.sleep(delay)
 
+        start = time.perf_counter()
         try:
-            df = yf.download(
-                normalize_ticker(ticker),
-                period=period,
-                interval=interval,
-                auto_adjust=False,
-                progress=False,
-                threads=False,          # avoid concurrency oddities
-                session=_session(),
-            )
+            try:
+                df = yf.download(
+                    normalize_ticker(ticker),
+                    period=period,
+                    interval=interval,
+                    auto_adjust=False,
+                    progress=False,
+                    threads=False,          # avoid concurrency oddities
+                    session=_session(),
+                )
+            finally:
+                # one sample per attempt: the backoff sleeps aren't Yahoo's latency
+                latency.record("yahoo", time.perf_counter() - start)
             if df is not None and not df.empty:
                 return df
             last_err = "empty dataframe"
@@ -75,50 +160,171 @@ def _stooq_fallback(ticker: str, period: Period, interval: str) -> pd.DataFrame:
 
     # crude translation of period to start date
     end = pd.Timestamp.utcnow().normalize()
-    months = {"5d":0, "1mo":1, "3mo":3, "6mo":6, "1y":12, "2y":24, "5y":60, "10y":120, "ytd":12, "max":240}
-    start = end - pd.DateOffset(months=months.get(period, 12))
+    if period == "5d":
+        start = end - pd.Timedelta(days=7)  # calendar days, so weekends still leave ~5 bars
+    elif period == "ytd":
+        start = end.replace(month=1, day=1)
+    else:
+        months = {"1mo":1, "3mo":3, "6mo":6, "1y":12, "2y":24, "5y":60, "10y":120, "max":240}
+        start = end - pd.DateOffset(months=months.get(period, 12))
 
     rdr = StooqDailyReader(symbols=normalize_ticker(ticker), start=start, end=end)
-    df = rdr.read().sort_index()
+    # pandas-datareader 0.10 takes no freq kwarg, but _get_params reads self.freq
+    rdr.freq = STOOQ_FREQ.get(interval, "d")
+    df = rdr.read()
     if df is None or df.empty:
         return pd.DataFrame()
-
-    df = df.rename(columns={"Open":"Open","High":"High","Low":"Low","Close":"Close","Volume":"Volume"})
     return df
 
-def fetch_ohlcv(ticker: str, period: Period = "1y", interval: str = "1d") -> pd.DataFrame:
+def _hedged(ticker: str, period: Period, interval: str) -> pd.DataFrame:
     """
-    Returns a DataFrame with columns: ts, open, high, low, close, volume (UTC).
-    Tries Yahoo first with polite headers/backoff; if blocked/empty, falls back to Stooq for daily bars.
+    Yahoo first; if it hasn't answered within hedge_delay() (or fails/returns nothing), race Stooq.
+    First non-empty frame wins and the other call is told to stop. Yahoo's error is what surfaces
+    when both come back empty-handed, same as the sequential path.
     """
+    deadline = time.monotonic() + settings.HEDGE_DEADLINE_SECONDS
+    cancel = threading.Event()
+    yahoo = _YAHOO_POOL.submit(_download_yf, ticker, period, interval, cancel)
+    stooq = None
+    yahoo_err: HTTPException | None = None
+
+    def start_stooq():
+        return _STOOQ_POOL.submit(_timed, "stooq", _stooq_fallback, ticker, period, interval, cancel=cancel)
+
+    done, _ = wait([yahoo], timeout=min(hedge_delay(), settings.HEDGE_DEADLINE_SECONDS))
+    if not done:
+        stooq = start_stooq()
+
+    pending = {f for f in (yahoo, stooq) if f is not None}
     try:
-        df = _download_yf(ticker, period, interval)
+        while pending:
+            done, pending = wait(pending, timeout=max(0.0, deadline - time.monotonic()),
+                                 return_when=FIRST_COMPLETED)
+            if not done:
+                # overall deadline: give up on both rather than hold the request thread
+                log.warning("upstream deadline hit for %s %s/%s", ticker, period, interval)
+                raise yahoo_err or HTTPException(status_code=504, detail="Upstream timeout")
+            for f in done:
+                try:
+                    df = f.result()
+                except HTTPException as e:
+                    if f is yahoo:
+                        yahoo_err = e
+                    df = None
+                except Exception:
+                    # Stooq/pandas-datareader failures are best-effort, but shouldn't vanish
+                    log.exception("%s fetch failed for %s %s/%s", "yahoo" if f is yahoo else "stooq",
+                                  ticker, period, interval)
+                    df = None
+                if df is not None and not df.empty:
+                    return df
+                if f is yahoo and stooq is None:
+                    # Yahoo gave up before the hedge fired: plain fallback
+                    stooq = start_stooq()
+                    pending.add(stooq)
+    finally:
+        cancel.set()  # stops Yahoo retries; an in-flight Stooq read is simply abandoned
+
+    if yahoo_err is not None:
+        raise yahoo_err
+    return pd.DataFrame()
+
+def _sequential(ticker: str, period: Period, interval: str) -> pd.DataFrame:
+    try:
+        return _download_yf(ticker, period, interval)
     except HTTPException as he:
         # For daily/weekly/monthly, try a best-effort fallback; otherwise bubble up
-        if interval in ("1d", "1wk", "1mo"):
-            df = _stooq_fallback(ticker, period, interval)
+        if interval in STOOQ_FREQ:
+            try:
+                df = _timed("stooq", _stooq_fallback, ticker, period, interval)
+            except Exception:
+                # a broken fallback must not turn Yahoo's 5xx into a 500
+                log.exception("stooq fetch failed for %s %s/%s", ticker, period, interval)
+                raise he
             if df is None or df.empty:
                 raise he
-        else:
-            raise he
+            return df
+        raise he
+
+def fetch_ohlcv(ticker: str, period: Period = "1y", interval: str = "1d") -> pd.DataFrame:
+    """
+    Returns a DataFrame with columns: ts, open, high, low, close, volume (UTC).
+    Tries Yahoo first with polite headers/backoff. For daily/weekly/monthly bars Stooq is either
+    raced against a slow Yahoo call (HEDGE_ENABLED) or used after Yahoo fails.
+    """
+    if settings.HEDGE_ENABLED and interval in STOOQ_FREQ:
+        df = _hedged(ticker, period, interval)
+    else:
+        df = _sequential(ticker, period, interval)
 
     if df is None or df.empty:
         # yfinance sometimes returns empty silently -> treat as no data
         raise HTTPException(status_code=404, detail="No data for ticker/interval")
 
+    return _normalize(df)
+
+def _normalize(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Any provider frame -> ts, open, high, low, close, volume; ts tz-aware UTC, ascending, unique,
+    float64 prices / int64 volume. Yahoo and Stooq come out indistinguishable.
+    """
+    if isinstance(df.columns, pd.MultiIndex):
+        # yfinance labels single-ticker downloads (field, ticker)
+        df = df.copy()
+        df.columns = df.columns.get_level_values(0)
+
     # normalize columns
-    df = df.rename(columns={
-        "Open":"open","High":"high","Low":"low","Close":"close","Volume":"volume"
-    })
+    df = df.rename(columns=lambda c: str(c).strip().lower())
 
     # ensure datetime index is tz-aware UTC
-    idx = df.index
-    if getattr(idx, "tz", None) is None:
+    idx = pd.DatetimeIndex(df.index)
+    if idx.tz is None:
         idx = idx.tz_localize(timezone.utc)
     else:
         idx = idx.tz_convert(timezone.utc)
-    df.index = idx
+    df.index = idx.rename("ts")
 
-    df = df.reset_index().rename(columns={"Date":"ts","Datetime":"ts"})
-    cols = ["ts","open","high","low","close","volume"]
-    return df[cols].dropna()
+    cols = ["open","high","low","close","volume"]
+    df = df[cols].dropna()
+    df = df[~df.index.duplicated(keep="last")].sort_index()
+    df = df.astype({"open":"float64","high":"float64","low":"float64","close":"float64","volume":"int64"})
+    return df.reset_index()
+
+def fetch_ohlcv_many(tickers: list[str], period: Period = "1y", interval: str = "1d") -> dict[str, pd.DataFrame]:
+    """
+    One yfinance round trip for several tickers (used for bulk backfills).
+    Returns {ticker: frame shaped like fetch_ohlcv}; tickers Yahoo had nothing for are left out.
+    """
+    symbols = sorted({normalize_ticker(t) for t in tickers})
+    if not symbols:
+        return {}
+
+    try:
+        raw = yf.download(
+            symbols,
+            period=period,
+            interval=interval,
+            auto_adjust=False,
+            progress=False,
+            group_by="ticker",
+            threads=False,
+            session=_session(),
+        )
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=f"Upstream provider error: {type(e).__name__}: {e}")
+
+    out: dict[str, pd.DataFrame] = {}
+    if raw is None or raw.empty:
+        return out
+
+    for t in symbols:
+        if isinstance(raw.columns, pd.MultiIndex):
+            if t not in raw.columns.get_level_values(0):
+                continue
+            sub = raw[t]
+        else:
+            sub = raw
+        sub = sub.dropna(how="all")
+        if not sub.empty:
+            out[t] = _normalize(sub)
+    return out
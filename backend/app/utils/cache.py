@@ -12,3 +12,48 @@ def cache_get(key: str):
 
 def cache_set(key: str, value, ttl: int | None = None):
     _redis.set(key, json.dumps(value), ex=ttl or settings.REDIS_TTL_SECONDS)
+
+def cache_delete_prefix(prefix: str) -> int:
+    """Delete all keys starting with prefix (SCAN, so it never blocks Redis like KEYS would)."""
+    n = 0
+    batch = []
+    for k in _redis.scan_iter(match=f"{prefix}*", count=500):
+        batch.append(k)
+        if len(batch) >= 500:
+            n += _redis.delete(*batch)
+            batch = []
+    if batch:
+        n += _redis.delete(*batch)
+    return n
+
+def cache_hget(key: str, *fields: str) -> list[bytes | None]:
+    return _redis.hmget(key, fields)
+
+def cache_hset(key: str, mapping: dict, ttl: int | None = None):
+    pipe = _redis.pipeline()
+    pipe.hset(key, mapping=mapping)
+    pipe.expire(key, ttl or settings.REDIS_TTL_SECONDS)
+    pipe.execute()
+
+def cache_mget(keys: list[str]) -> list[str | None]:
+    return [v.decode() if v is not None else None for v in _redis.mget(keys)] if keys else []
+
+def cache_incr(*keys: str) -> None:
+    """Bump counters (version keys never expire)."""
+    pipe = _redis.pipeline()
+    for k in keys:
+        pipe.incr(k)
+    pipe.execute()
+
+def cache_delete(*keys: str) -> int:
+    return _redis.delete(*keys) if keys else 0
+
+def cache_sadd(members_by_key: dict[str, list]) -> None:
+    pipe = _redis.pipeline()
+    for k, members in members_by_key.items():
+        if members:
+            pipe.sadd(k, *members)
+    pipe.execute()
+
+def cache_sunion(keys: list[str]) -> set[str]:
+    return {m.decode() for m in _redis.sunion(keys)} if keys else set()
@@ -0,0 +1,81 @@
+# app/utils/http_cache.py
+"""
+Response-level cache: each entry is a Redis hash holding the serialised JSON body, a gzip copy
+made once at fill time, and a strong ETag per representation ("<hash>" for identity,
+"<hash>-gz" for gzip). Hits are served straight from those bytes.
+"""
+import gzip
+import hashlib
+import json
+
+from fastapi import Request, Response
+
+from app.utils.cache import cache_hget, cache_hset
+
+PREFIX = "http:"
+GZIP_MIN_BYTES = 1024  # below this gzip isn't worth the header
+
+def _accepts_gzip(request: Request) -> bool:
+    return "gzip" in request.headers.get("accept-encoding", "").lower()
+
+def _gz_tag(etag: str) -> str:
+    """Distinct strong validator for the gzip representation: "<hash>" -> "<hash>-gz"."""
+    return etag[:-1] + '-gz"'
+
+def _base_tag(tag: str) -> str:
+    tag = tag.strip().removeprefix("W/")
+    return tag[:-4] + '"' if tag.endswith('-gz"') else tag
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    """True if If-None-Match names either representation of the entry whose identity tag is `etag`."""
+    inm = request.headers.get("if-none-match")
+    if not inm:
+        return False
+    if inm.strip() == "*":
+        return True
+    # weak comparison is what If-None-Match calls for; either encoding's tag revalidates the entry
+    # and the 304 then carries the tag of the representation this request would have received
+    return etag in {_base_tag(t) for t in inm.split(",")}
+
+def _headers(etag: str) -> dict:
+    return {"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+
+def _serves_gzip(request: Request, has_gz: bool) -> bool:
+    return has_gz and _accepts_gzip(request)
+
+def _not_modified(request: Request, etag: str, has_gz: bool) -> Response:
+    return Response(status_code=304, headers=_headers(_gz_tag(etag) if _serves_gzip(request, has_gz) else etag))
+
+def _response(request: Request, body: bytes, gz: bytes | None, etag: str) -> Response:
+    if _serves_gzip(request, bool(gz)):
+        headers = _headers(_gz_tag(etag))
+        headers["Content-Encoding"] = "gzip"
+        return Response(content=gz, media_type="application/json", headers=headers)
+    return Response(content=body, media_type="application/json", headers=_headers(etag))
+
+def cached_response(request: Request, key: str) -> Response | None:
+    """304 / cached body for `key`, or None on a miss. Never touches the DB."""
+    k = PREFIX + key
+    if request.headers.get("if-none-match"):
+        # revalidation: look at the tag alone so a 304 never pulls the body out of Redis
+        etag, has_gz = cache_hget(k, "etag", "has_gz")
+        if etag is not None and _etag_matches(request, etag.decode()):
+            return _not_modified(request, etag.decode(), has_gz == b"1")
+
+    fields = ("etag", "json", "gz") if _accepts_gzip(request) else ("etag", "json")
+    etag, body, *gz = cache_hget(k, *fields)
+    if etag is None or body is None:
+        return None
+    return _response(request, body, gz[0] if gz else None, etag.decode())
+
+def store_response(request: Request, key: str, payload) -> Response:
+    """Serialise + compress once, cache all variants, and answer the current request from them."""
+    body = json.dumps(payload, separators=(",", ":")).encode()
+    # identity tag; the gzip body is served under _gz_tag(etag)
+    etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+    gz = gzip.compress(body, compresslevel=6) if len(body) >= GZIP_MIN_BYTES else b""
+    cache_hset(PREFIX + key, {"json": body, "gz": gz, "etag": etag, "has_gz": "1" if gz else "0"})
+
+    if _etag_matches(request, etag):
+        return _not_modified(request, etag, bool(gz))
+    return _response(request, body, gz or None, etag)
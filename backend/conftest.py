@@ -0,0 +1,6 @@
+# backend/conftest.py
+# Settings requires the Postgres credentials; the unit tests never connect, so any value will do.
+import os
+
+for var in ("POSTGRES_USER", "POSTGRES_PASSWORD", "POSTGRES_DB"):
+    os.environ.setdefault(var, "test")
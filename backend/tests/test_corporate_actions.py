@@ -0,0 +1,78 @@
+# backend/tests/test_corporate_actions.py
+import numpy as np
+import pandas as pd
+
+from app.services.corporate_actions import adjustment_multipliers, apply_adjustments, split_factors
+
+EX = pd.Timestamp("2024-01-10", tz="UTC")
+
+def _factors(*rows) -> pd.DataFrame:
+    return pd.DataFrame(rows, columns=["ex_ts", "kind", "price_factor", "volume_factor"])
+
+SPLIT = _factors((EX, "split", *split_factors(2.0)))
+DIVIDEND = _factors((EX, "dividend", 0.99, 1.0))
+
+def _days() -> pd.Series:
+    # 8th, 9th (before), 10th (ex-date), 11th, 12th (after)
+    return pd.Series(pd.date_range("2024-01-08", "2024-01-12", freq="D", tz="UTC"))
+
+def test_split_applies_strictly_before_ex_date():
+    pm, vm = adjustment_multipliers(_days(), SPLIT)
+    np.testing.assert_allclose(pm, [0.5, 0.5, 1, 1, 1])
+    np.testing.assert_allclose(vm, [2, 2, 1, 1, 1])
+
+def test_split_skips_bars_ingested_after_ex_date():
+    ts = _days()
+    epoch = pd.Series(pd.Timestamp("1970-01-01", tz="UTC"), index=ts.index)
+    pm, _ = adjustment_multipliers(ts, SPLIT, epoch)
+    np.testing.assert_allclose(pm, [0.5, 0.5, 1, 1, 1])
+
+    # fetched after the split: Yahoo already returned these bars adjusted
+    late = pd.Series(EX + pd.Timedelta(days=3), index=ts.index)
+    pm, vm = adjustment_multipliers(ts, SPLIT, late)
+    np.testing.assert_allclose(pm, np.ones(5))
+    np.testing.assert_allclose(vm, np.ones(5))
+
+    # fetched the day before the ex-date: still unadjusted
+    just_before = pd.Series(EX - pd.Timedelta(seconds=1), index=ts.index)
+    pm, _ = adjustment_multipliers(ts, SPLIT, just_before)
+    np.testing.assert_allclose(pm, [0.5, 0.5, 1, 1, 1])
+
+def test_dividend_ignores_ingested_at():
+    ts = _days()
+    late = pd.Series(EX + pd.Timedelta(days=3), index=ts.index)
+    pm, vm = adjustment_multipliers(ts, DIVIDEND, late)
+    np.testing.assert_allclose(pm, [0.99, 0.99, 1, 1, 1])
+    np.testing.assert_allclose(vm, np.ones(5))
+
+def test_intraday_bars_around_ex_date():
+    ts = pd.Series(pd.to_datetime(
+        ["2024-01-09 23:59", "2024-01-10 00:00", "2024-01-10 14:30"], utc=True,
+    ))
+    pm, _ = adjustment_multipliers(ts, SPLIT)
+    np.testing.assert_allclose(pm, [0.5, 1, 1])
+
+def test_factors_compound_across_actions():
+    factors = _factors(
+        (EX, "split", *split_factors(2.0)),
+        (EX + pd.Timedelta(days=1), "dividend", 0.9, 1.0),
+    )
+    pm, vm = adjustment_multipliers(_days(), factors)
+    np.testing.assert_allclose(pm, [0.45, 0.45, 0.9, 1, 1])
+    np.testing.assert_allclose(vm, [2, 2, 1, 1, 1])
+
+def test_apply_adjustments_scales_prices_and_volume():
+    ts = _days()
+    df = pd.DataFrame({
+        "ts": ts, "open": 100.0, "high": 100.0, "low": 100.0, "close": 100.0, "volume": 1000,
+        "ingested_at": pd.Timestamp("1970-01-01", tz="UTC"),
+    })
+    out = apply_adjustments(df, SPLIT)
+    assert out["close"].tolist() == [50, 50, 100, 100, 100]
+    assert out["volume"].tolist() == [2000, 2000, 1000, 1000, 1000]
+    assert df["close"].tolist() == [100] * 5  # input untouched
+
+def test_no_factors_is_identity():
+    pm, vm = adjustment_multipliers(_days(), _factors())
+    np.testing.assert_allclose(pm, np.ones(5))
+    np.testing.assert_allclose(vm, np.ones(5))
@@ -0,0 +1,62 @@
+# backend/tests/test_portfolio_bulk.py
+import json
+
+import pandas as pd
+import pytest
+from fastapi import HTTPException
+
+from app.api.portfolio import _parse_holdings, _validate_holdings
+
+def _frame(*rows) -> pd.DataFrame:
+    return pd.DataFrame(rows, columns=["ticker", "qty", "avg_price"])
+
+def test_lots_merge_at_weighted_average():
+    out = _validate_holdings(_frame((" aapl", 10, 100.0), ("AAPL", 30, 200.0), ("msft", 5, 50.0)))
+    assert out["ticker"].tolist() == ["AAPL", "MSFT"]
+    assert out["qty"].tolist() == [40, 5]
+    assert out["avg_price"].tolist() == pytest.approx([175.0, 50.0])
+
+def test_zero_qty_keeps_quoted_price():
+    out = _validate_holdings(_frame(("AAPL", 0, 123.0)))
+    assert out["avg_price"].tolist() == [123.0]
+
+@pytest.mark.parametrize("qty, price", [
+    (float("inf"), 1.0), (1.0, float("-inf")), (float("nan"), 1.0), ("abc", 1.0), (-1, 1.0), (1, -0.5),
+])
+def test_rejects_invalid_numbers(qty, price):
+    with pytest.raises(HTTPException) as e:
+        _validate_holdings(_frame(("OK", 1, 1.0), ("BAD", qty, price)))
+    assert e.value.status_code == 422
+    assert e.value.detail["rows"] == [1]
+    assert e.value.detail["count"] == 1
+
+def test_rejects_missing_ticker():
+    with pytest.raises(HTTPException) as e:
+        _validate_holdings(_frame(("  ", 1, 1.0), (None, 1, 1.0)))
+    assert e.value.detail["rows"] == [0, 1]
+
+def test_csv_infinity_is_rejected():
+    df = _parse_holdings(b"ticker,qty,avg_price\nAAPL,inf,1\n", "text/csv")
+    with pytest.raises(HTTPException) as e:
+        _validate_holdings(df)
+    assert e.value.status_code == 422
+
+@pytest.mark.parametrize("row", [
+    {"ticker": "AAPL", "qty": True, "avg_price": 1.0},
+    {"ticker": "AAPL", "qty": 1, "avg_price": "1.0"},
+    {"ticker": 123, "qty": 1, "avg_price": 1.0},
+])
+def test_json_rejects_wrong_types(row):
+    with pytest.raises(HTTPException) as e:
+        _parse_holdings(json.dumps([row]).encode(), "application/json")
+    assert e.value.status_code == 422
+
+def test_json_empty_list_is_empty_frame():
+    df = _parse_holdings(b"[]", "application/json")
+    assert df.empty
+    assert list(df.columns) == ["ticker", "qty", "avg_price"]
+    assert _validate_holdings(df).empty
+
+def test_json_object_with_holdings_key():
+    df = _parse_holdings(b'{"holdings": [{"ticker": "aapl", "qty": 2, "avg_price": 10}]}', "application/json")
+    assert _validate_holdings(df).to_dict("records") == [{"ticker": "AAPL", "qty": 2.0, "avg_price": 10.0}]
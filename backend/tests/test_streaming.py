@@ -0,0 +1,39 @@
+# backend/tests/test_streaming.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services import indicators as ind
+from app.services.streaming import indicator_batches
+
+PARAMS = dict(sma=[3, 10], ema=[4, 12], rsi_period=5, bb_window=8, bb_std=2.0)
+
+def _bars(n: int = 53) -> pd.DataFrame:
+    rng = np.random.default_rng(7)
+    return pd.DataFrame({
+        "ts": pd.date_range("2024-01-01", periods=n, freq="D", tz="UTC"),
+        "close": 100 + rng.normal(0, 1, n).cumsum(),
+    })
+
+def _full(df: pd.DataFrame) -> pd.DataFrame:
+    close = df["close"]
+    out = pd.DataFrame({"ts": df["ts"]})
+    for w in PARAMS["sma"]:
+        out[f"sma{w}"] = ind.sma(close, w)
+    for w in PARAMS["ema"]:
+        out[f"ema{w}"] = ind.ema(close, w)
+    out["rsi"] = ind.rsi(close, PARAMS["rsi_period"])
+    out["bb_mid"], out["bb_upper"], out["bb_lower"] = ind.bollinger(close, PARAMS["bb_window"], PARAMS["bb_std"])
+    return out
+
+@pytest.mark.parametrize("size", [1, 5, 7, 53])
+def test_batched_matches_full_series(size):
+    df = _bars()
+    batches = (df.iloc[i:i + size] for i in range(0, len(df), size))
+    got = pd.concat(indicator_batches(batches, **PARAMS), ignore_index=True)
+    pd.testing.assert_frame_equal(got, _full(df), check_exact=False, rtol=1e-9)
+
+def test_one_row_per_bar_per_batch():
+    df = _bars(12)
+    sizes = [len(b) for b in indicator_batches((df.iloc[:5], df.iloc[5:]), **PARAMS)]
+    assert sizes == [5, 7]